@@ -1,7 +1,8 @@
 import streamlit as st
 import plotly.graph_objects as go
+import numpy as np
 from utils.data_collector import CryptoDataCollector
-from datetime import datetime
+from utils.downsampling import lttb_indices
 
 st.set_page_config(
     page_title="Bitcoin Mining Analytics",
@@ -9,23 +10,26 @@ st.set_page_config(
     layout="wide"
 )
 
-# Initialize session state
-if 'data_collector' not in st.session_state:
-    st.session_state.data_collector = CryptoDataCollector()
-    st.session_state.data_loaded = False
+@st.cache_resource(ttl=900, show_spinner=False)
+def get_collector():
+    """Collect data once for all sessions, refreshing every 15 minutes"""
+    collector = CryptoDataCollector()
+    # Raise rather than return so a failed load is not cached
+    if not collector.collect_all_data() or collector.price_data is None:
+        raise RuntimeError("Failed to load data")
+    return collector
+
+@st.cache_data(show_spinner=False)
+def downsample_indices(prices):
+    """Pick the rows that shape the price chart once per price series"""
+    return lttb_indices(prices)
 
 def load_data():
     """Load and prepare data"""
     try:
-        if not st.session_state.data_loaded:
-            with st.spinner('Loading data...'):
-                success = st.session_state.data_collector.collect_all_data()
-                if success:
-                    st.session_state.data_loaded = True
-                    return True
-                else:
-                    st.error("Failed to load data")
-                    return False
+        with st.spinner('Loading data...'):
+            st.session_state.data_collector = get_collector()
+        st.session_state.data_loaded = True
         return True
     except Exception as e:
         st.error(f"Error loading data: {e}")
@@ -37,36 +41,42 @@ def main():
     if load_data():
         price_data = st.session_state.data_collector.price_data
         
-        # Overview metrics
+        # Overview metrics, read straight from the underlying array
+        prices = price_data['price'].to_numpy()
         col1, col2, col3 = st.columns(3)
         
         with col1:
             st.metric(
                 "Current Bitcoin Price",
-                f"${price_data['price'].iloc[-1]:,.2f}"
+                f"${prices[-1]:,.2f}"
             )
             
         with col2:
-            daily_return = price_data['price'].pct_change().iloc[-1] * 100
+            # A single-point history has no previous price to compare with
+            if len(prices) > 1:
+                daily_return = f"{(prices[-1] / prices[-2] - 1) * 100:.2f}%"
+            else:
+                daily_return = "N/A"
             st.metric(
                 "24h Change",
-                f"{daily_return:.2f}%"
+                daily_return
             )
             
         with col3:
             st.metric(
                 "30-Day High",
-                f"${price_data['price'].max():,.2f}"
+                f"${np.nanmax(prices):,.2f}"
             )
 
         # Price overview chart
         st.subheader("Price Overview")
         
         fig = go.Figure()
+        plot_data = price_data.iloc[downsample_indices(prices)]
         
-        fig.add_trace(go.Scatter(
-            x=price_data['timestamp'],
-            y=price_data['price'],
+        fig.add_trace(go.Scattergl(
+            x=plot_data['timestamp'],
+            y=plot_data['price'],
             name='Price',
             line=dict(color='blue')
         ))
@@ -1,5 +1,6 @@
 import streamlit as st
 import plotly.graph_objects as go
+import numpy as np
 
 st.set_page_config(page_title="Mining Calculator", layout="wide")
 
@@ -14,18 +15,24 @@ class MiningCalculator:
             'difficulty': 71.8e6
         }
 
-    def calculate_profitability(self, btc_price, params):
-        """Calculate mining profitability"""
+    def _daily_terms(self, params):
+        """Calculate the price-independent daily BTC reward and power cost"""
         # Daily BTC reward calculation
         daily_btc = (params['hashrate'] * 1e12 * 86400) / (params['difficulty'] * 2**32)
         
+        # Power cost calculation
+        daily_power_cost = (params['power_consumption'] / 1000) * 24 * params['power_cost']
+        
+        return daily_btc, daily_power_cost
+
+    def calculate_profitability(self, btc_price, params):
+        """Calculate mining profitability"""
+        daily_btc, daily_power_cost = self._daily_terms(params)
+        
         # Revenue calculations
         daily_revenue = daily_btc * btc_price
         pool_fee_cost = daily_revenue * (params['pool_fee'] / 100)
         
-        # Power cost calculation
-        daily_power_cost = (params['power_consumption'] / 1000) * 24 * params['power_cost']
-        
         # Profit calculations
         daily_profit = daily_revenue - daily_power_cost - pool_fee_cost
         monthly_profit = daily_profit * 30
@@ -45,18 +52,25 @@ class MiningCalculator:
             'Break-even Price': daily_power_cost/daily_btc if daily_btc > 0 else float('inf')
         }
 
+    def _profit_vector(self, prices, params):
+        """Calculate daily profit for an array of Bitcoin prices"""
+        # Daily profit is affine in price, so the price-independent terms
+        # are computed once and broadcast over the whole array
+        daily_btc, daily_power_cost = self._daily_terms(params)
+        revenue = daily_btc * prices
+        return revenue * (1 - params['pool_fee'] / 100) - daily_power_cost
+
     def plot_profitability_chart(self, params):
         """Create profitability analysis chart"""
-        prices = range(20000, 100000, 5000)
-        profits = [self.calculate_profitability(price, params)['Daily Profit'] 
-                  for price in prices]
+        prices = np.linspace(20000, 100000, 500)
+        profits = self._profit_vector(prices, params)
         
         fig = go.Figure()
         
         fig.add_trace(go.Scatter(
-            x=list(prices),
+            x=prices,
             y=profits,
-            mode='lines+markers',
+            mode='lines',
             name='Daily Profit'
         ))
         
@@ -1,46 +1,22 @@
 import streamlit as st
 import plotly.graph_objects as go
-from plotly.subplots import make_subplots
 import pandas as pd
 import numpy as np
+from utils.downsampling import lttb_indices
+from utils.indicators import rsi, macd, bollinger_bands
 
 st.set_page_config(page_title="Technical Analysis", layout="wide")
 
 class TechnicalAnalysis:
-    @staticmethod
-    def calculate_rsi(data, periods=14):
-        """Calculate Relative Strength Index"""
-        delta = data.diff()
-        gain = (delta.where(delta > 0, 0)).rolling(window=periods).mean()
-        loss = (-delta.where(delta < 0, 0)).rolling(window=periods).mean()
-        rs = gain / loss
-        return 100 - (100 / (1 + rs))
-
-    @staticmethod
-    def calculate_macd(data, fast=12, slow=26, signal=9):
-        """Calculate MACD and Signal Line"""
-        exp1 = data.ewm(span=fast, adjust=False).mean()
-        exp2 = data.ewm(span=slow, adjust=False).mean()
-        macd = exp1 - exp2
-        signal_line = macd.ewm(span=signal, adjust=False).mean()
-        return macd, signal_line
-
-    @staticmethod
-    def calculate_bollinger_bands(data, window=20, num_std=2):
-        """Calculate Bollinger Bands"""
-        middle_band = data.rolling(window=window).mean()
-        std_dev = data.rolling(window=window).std()
-        upper_band = middle_band + (std_dev * num_std)
-        lower_band = middle_band - (std_dev * num_std)
-        return middle_band, upper_band, lower_band
-
     def create_candlestick_chart(self, df):
         """Create candlestick chart with volume"""
+        from plotly.subplots import make_subplots
+
         fig = make_subplots(rows=2, cols=1, shared_xaxes=True, 
                            vertical_spacing=0.03, row_heights=[0.7, 0.3])
 
         # Price line
-        fig.add_trace(go.Scatter(
+        fig.add_trace(go.Scattergl(
             x=df.index,
             y=df['price'],
             name='Price',
@@ -69,7 +45,7 @@ class TechnicalAnalysis:
         """Create RSI chart"""
         fig = go.Figure()
 
-        fig.add_trace(go.Scatter(
+        fig.add_trace(go.Scattergl(
             x=df.index,
             y=df['RSI'],
             name='RSI',
@@ -90,20 +66,22 @@ class TechnicalAnalysis:
 
     def create_macd_chart(self, df):
         """Create MACD chart"""
+        from plotly.subplots import make_subplots
+
         fig = make_subplots(rows=2, cols=1, shared_xaxes=True,
                            vertical_spacing=0.03, row_heights=[0.7, 0.3])
 
         # MACD
         fig.add_trace(
-            go.Scatter(x=df.index, y=df['MACD'],
-                      name='MACD', line=dict(color='blue')),
+            go.Scattergl(x=df.index, y=df['MACD'],
+                        name='MACD', line=dict(color='blue')),
             row=1, col=1
         )
 
         # Signal line
         fig.add_trace(
-            go.Scatter(x=df.index, y=df['Signal_Line'],
-                      name='Signal Line', line=dict(color='orange')),
+            go.Scattergl(x=df.index, y=df['Signal_Line'],
+                        name='Signal Line', line=dict(color='orange')),
             row=1, col=1
         )
 
@@ -125,21 +103,21 @@ class TechnicalAnalysis:
         """Create Bollinger Bands chart"""
         fig = go.Figure()
 
-        fig.add_trace(go.Scatter(
+        fig.add_trace(go.Scattergl(
             x=df.index,
             y=df['price'],
             name='Price',
             line=dict(color='blue')
         ))
 
-        fig.add_trace(go.Scatter(
+        fig.add_trace(go.Scattergl(
             x=df.index,
             y=df['BB_upper'],
             name='Upper Band',
             line=dict(color='gray', dash='dash')
         ))
 
-        fig.add_trace(go.Scatter(
+        fig.add_trace(go.Scattergl(
             x=df.index,
             y=df['BB_lower'],
             name='Lower Band',
@@ -155,6 +133,36 @@ class TechnicalAnalysis:
 
         return fig
 
+@st.cache_data(show_spinner=False)
+def compute_indicators(price):
+    """Calculate all indicators, reusing the result while the price series is unchanged"""
+    # Convert once, compute on arrays and wrap everything in a single DataFrame.
+    # float32 is ample for chart-only indicators and halves memory traffic
+    values = price.to_numpy(dtype=np.float32)
+    macd_line, signal_line = macd(values)
+    bb_middle, bb_upper, bb_lower = bollinger_bands(values)
+    return pd.DataFrame({
+        'RSI': rsi(values),
+        'MACD': macd_line,
+        'Signal_Line': signal_line,
+        'BB_middle': bb_middle,
+        'BB_upper': bb_upper,
+        'BB_lower': bb_lower
+    }, index=price.index)
+
+@st.cache_data(show_spinner=False)
+def downsample_indices(price):
+    """Pick the rows that shape the price chart once per price series"""
+    return lttb_indices(price)
+
+def get_chart(name, build, df):
+    """Reuse the figure built on a previous rerun while its data is unchanged"""
+    charts = st.session_state.setdefault('technical_charts', {})
+    signature = (df.index[0], df.index[-1], hash(df['price'].to_numpy().tobytes()))
+    if name not in charts or charts[name][0] != signature:
+        charts[name] = (signature, build(df))
+    return charts[name][1]
+
 def main():
     st.title('Bitcoin Technical Analysis')
 
@@ -162,22 +170,27 @@ def main():
         # Get data and calculate indicators
         df = st.session_state.data_collector.price_data.copy()
         df.set_index('timestamp', inplace=True)
-        
+
         # Calculate indicators
-        df['RSI'] = TechnicalAnalysis.calculate_rsi(df['price'])
-        df['MACD'], df['Signal_Line'] = TechnicalAnalysis.calculate_macd(df['price'])
-        df['BB_middle'], df['BB_upper'], df['BB_lower'] = TechnicalAnalysis.calculate_bollinger_bands(df['price'])
+        indicators = compute_indicators(df['price'])
+        df[indicators.columns] = indicators
+
+        # Only send the points that shape the charts to the browser
+        df = df.iloc[downsample_indices(df['price'].to_numpy())]
 
         # Create analysis instance
         analysis = TechnicalAnalysis()
 
-        # Create tabs for different indicators
-        tab1, tab2, tab3, tab4 = st.tabs([
-            'Price Overview', 'RSI', 'MACD', 'Bollinger Bands'
-        ])
+        # Select one indicator view; unlike st.tabs, only the visible
+        # view's chart is built on each rerun
+        view = st.radio(
+            'Indicator',
+            ['Price Overview', 'RSI', 'MACD', 'Bollinger Bands'],
+            horizontal=True
+        )
 
-        with tab1:
-            st.plotly_chart(analysis.create_candlestick_chart(df), use_container_width=True)
+        if view == 'Price Overview':
+            st.plotly_chart(get_chart('price', analysis.create_candlestick_chart, df), use_container_width=True)
             st.markdown("""
             ### Price Overview
             The price chart shows Bitcoin's price movement over time. Key patterns to look for:
@@ -186,8 +199,8 @@ def main():
             - Chart patterns (e.g., head and shoulders, triangles)
             """)
 
-        with tab2:
-            st.plotly_chart(analysis.create_rsi_chart(df), use_container_width=True)
+        elif view == 'RSI':
+            st.plotly_chart(get_chart('rsi', analysis.create_rsi_chart, df), use_container_width=True)
             st.markdown("""
             ### RSI (Relative Strength Index)
             RSI measures momentum and can indicate overbought or oversold conditions:
@@ -196,8 +209,8 @@ def main():
             - Trend strength increases as RSI moves to extremes
             """)
 
-        with tab3:
-            st.plotly_chart(analysis.create_macd_chart(df), use_container_width=True)
+        elif view == 'MACD':
+            st.plotly_chart(get_chart('macd', analysis.create_macd_chart, df), use_container_width=True)
             st.markdown("""
             ### MACD (Moving Average Convergence Divergence)
             MACD helps identify trend changes and momentum:
@@ -206,8 +219,8 @@ def main():
             - Histogram shows momentum strength
             """)
 
-        with tab4:
-            st.plotly_chart(analysis.create_bollinger_bands_chart(df), use_container_width=True)
+        elif view == 'Bollinger Bands':
+            st.plotly_chart(get_chart('bollinger', analysis.create_bollinger_bands_chart, df), use_container_width=True)
             st.markdown("""
             ### Bollinger Bands
             Bollinger Bands show volatility and potential price levels:
@@ -1,13 +1,33 @@
 import streamlit as st
 import plotly.graph_objects as go
-import plotly.express as px
-import yfinance as yf
 import pandas as pd
+import numpy as np
 from datetime import datetime, timedelta
+from utils.indicators import rolling_corr
 import time
 
 st.set_page_config(page_title="Correlation Analysis", layout="wide")
 
+@st.cache_data(ttl=3600, show_spinner=False)
+def _download_closes(symbols, start_date, end_date):
+    """Download closing prices for all symbols in one request, reusing the result for an hour"""
+    import yfinance as yf
+
+    data = yf.download(
+        list(symbols),
+        start=start_date,
+        end=end_date,
+        progress=False,
+        group_by='ticker',
+        threads=True
+    )
+    if data.empty:
+        raise ValueError(f"No data returned for {', '.join(symbols)}")
+    tickers = data.columns.get_level_values(0)
+    return pd.DataFrame({
+        symbol: data[symbol]['Close'] for symbol in symbols if symbol in tickers
+    })
+
 class CorrelationAnalysis:
     def __init__(self):
         self.asset_mapping = {
@@ -17,22 +37,14 @@ class CorrelationAnalysis:
             'TLT': 'Treasury Bonds'
         }
 
-    def safe_download_data(self, symbol, start_date, end_date, retries=3):
-        """Safely download data with retries"""
+    def safe_download_data(self, symbols, start_date, end_date, retries=3):
+        """Safely download closing prices for all symbols with retries"""
         for attempt in range(retries):
             try:
-                data = yf.download(
-                    symbol,
-                    start=start_date,
-                    end=end_date,
-                    progress=False
-                )
-                if not data.empty and 'Close' in data.columns:
-                    return data['Close'].squeeze()
-                time.sleep(1)
+                return _download_closes(tuple(symbols), start_date, end_date)
             except Exception as e:
                 if attempt == retries - 1:
-                    st.warning(f"Failed to fetch data for {symbol}")
+                    st.warning("Failed to fetch market data")
                 time.sleep(1)
         return None
 
@@ -48,25 +60,41 @@ class CorrelationAnalysis:
                     bitcoin_data['price'].values,
                     index=bitcoin_data['timestamp'],
                     name='Bitcoin'
-                ).pct_change().dropna()
+                ).pct_change().dropna().astype(np.float32)
                 assets['Bitcoin'] = bitcoin_returns
 
-            # Get other assets
-            for symbol, name in self.asset_mapping.items():
-                price_data = self.safe_download_data(symbol, start_date, end_date)
-                if price_data is not None:
-                    assets[name] = price_data.pct_change().dropna()
+            # Get other assets in a single batched download
+            closes = self.safe_download_data(self.asset_mapping.keys(), start_date, end_date)
+            if closes is not None:
+                for symbol, name in self.asset_mapping.items():
+                    price_data = closes[symbol].dropna() if symbol in closes else None
+                    if price_data is None or price_data.empty:
+                        st.warning(f"Failed to fetch data for {symbol}")
+                        continue
+                    # Returns only feed correlations, so float32 is precise enough
+                    assets[name] = price_data.pct_change().dropna().astype(np.float32)
 
         return assets if len(assets) > 1 else None
 
-    def calculate_correlations(self, assets_dict):
+    @staticmethod
+    def align_returns(assets_dict):
+        """Align all asset returns on a common date index"""
+        return pd.concat(assets_dict, axis=1).ffill().dropna()
+
+    @staticmethod
+    @st.cache_data(show_spinner=False)
+    def calculate_correlations(returns_data):
         """Calculate correlation matrix"""
-        returns_data = pd.DataFrame({name: returns for name, returns in assets_dict.items()})
-        returns_data = returns_data.fillna(method='ffill').dropna()
-        return returns_data.corr()
+        # One corrcoef call over the stacked returns instead of pairwise .corr()
+        corr = np.corrcoef(returns_data.to_numpy(), rowvar=False)
+        return pd.DataFrame(corr, index=returns_data.columns, columns=returns_data.columns)
 
-    def plot_correlation_heatmap(self, corr_matrix):
+    @staticmethod
+    @st.cache_data(show_spinner=False)
+    def plot_correlation_heatmap(corr_matrix):
         """Create correlation heatmap"""
+        import plotly.express as px
+
         fig = px.imshow(
             corr_matrix,
             color_continuous_scale='RdBu',
@@ -82,15 +110,27 @@ class CorrelationAnalysis:
         
         return fig
 
+    @staticmethod
+    @st.cache_data(show_spinner=False)
+    def calculate_rolling_correlations(df, base_asset, window):
+        """Calculate rolling correlations between one asset and all others"""
+        base = df[base_asset].to_numpy()
+        return pd.DataFrame({
+            asset: rolling_corr(base, df[asset].to_numpy(), window)
+            for asset in df.columns if asset != base_asset
+        }, index=df.index)
+
     def plot_rolling_correlation(self, df, asset1, asset2, window=30):
         """Create rolling correlation plot"""
-        rolling_corr = df[asset1].rolling(window=window).corr(df[asset2])
+        # Every pair for this window is computed and cached together, so
+        # switching the selected asset does not recompute anything
+        correlation = self.calculate_rolling_correlations(df, asset1, window)[asset2]
         
         fig = go.Figure()
         
         fig.add_trace(go.Scatter(
-            x=rolling_corr.index,
-            y=rolling_corr,
+            x=df.index,
+            y=correlation,
             mode='lines',
             name=f'{window}-Day Rolling Correlation'
         ))
@@ -132,11 +172,11 @@ def main():
             asset_data = correlation.fetch_market_data(start_date, end_date)
             
             if asset_data:
-                # Create combined DataFrame for analysis
-                combined_data = pd.DataFrame(asset_data)
+                # Align returns once and share them across the analyses below
+                combined_data = correlation.align_returns(asset_data)
                 
                 # Calculate correlations
-                correlation_matrix = correlation.calculate_correlations(asset_data)
+                correlation_matrix = correlation.calculate_correlations(combined_data)
                 
                 # Display correlation heatmap
                 st.subheader('Correlation Heatmap')
@@ -159,7 +199,12 @@ def main():
                         [asset for asset in asset_data.keys() if asset != 'Bitcoin']
                     )
                 
-                if selected_asset:
+                if selected_asset and window >= len(combined_data):
+                    st.info(
+                        f"Only {len(combined_data)} days of aligned data are available; "
+                        "choose a shorter rolling window or a longer date range."
+                    )
+                elif selected_asset:
                     st.plotly_chart(correlation.plot_rolling_correlation(
                         combined_data,
                         'Bitcoin',
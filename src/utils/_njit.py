@@ -0,0 +1,16 @@
+try:
+    from numba import njit as _numba_njit
+    HAS_NUMBA = True
+except ImportError:
+    _numba_njit = None
+    HAS_NUMBA = False
+
+def njit(*args, **kwargs):
+    """Compile with numba.njit when numba is installed, otherwise run as plain Python"""
+    if HAS_NUMBA:
+        return _numba_njit(*args, **kwargs)
+
+    # Support both @njit and @njit(...) without numba
+    if len(args) == 1 and callable(args[0]) and not kwargs:
+        return args[0]
+    return lambda func: func
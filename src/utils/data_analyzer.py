@@ -1,28 +1,227 @@
+import os
+import sys
 import pandas as pd
 import numpy as np
 from pathlib import Path
+from dataclasses import dataclass, fields
+import matplotlib
+matplotlib.use('Agg')  # Render off-screen; also safe inside worker processes
 import matplotlib.pyplot as plt
+from matplotlib.figure import Figure
+from matplotlib.backends.backend_agg import FigureCanvasAgg
 import seaborn as sns
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from hashlib import blake2b
 from datetime import datetime
 
+# Running the file directly (python src/utils/data_analyzer.py) leaves src/
+# off the import path; spawned plot workers re-import this file the same way
+if not __package__:
+    sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from utils.indicators import rsi, macd, rolling_mean, rolling_std, bollinger_bands
+from utils.downsampling import lttb_indices
+
+INDICATOR_FIELDS = ['rsi', 'macd', 'signal_line', 'bb_middle', 'bb_upper', 'bb_lower']
+
+# Indicator parameters; they are part of the cache key along with the version,
+# which must be bumped whenever the indicator code changes its output
+RSI_PERIODS = 14
+MACD_SPANS = (12, 26, 9)
+BOLLINGER_PARAMS = (20, 2)
+INDICATOR_CACHE_VERSION = 1
+
+# Report labels paired with their pre-bound format functions
+PRICE_FORMATS = [
+    ('Current Price', '${:.2f}'.format),
+    ('Average Price', '${:.2f}'.format),
+    ('Highest Price', '${:.2f}'.format),
+    ('Lowest Price', '${:.2f}'.format),
+    ('Price Volatility', '${:.2f}'.format),
+    ('7-Day Rolling Volatility', '{:.2f}%'.format)
+]
+RISK_FORMATS = [
+    ('Value at Risk (95%)', '{:.2f}%'.format),
+    ('Maximum Drawdown', '{:.2f}%'.format),
+    ('Annualized Return', '{:.2f}%'.format),
+    ('Annualized Volatility', '{:.2f}%'.format),
+    ('Sharpe Ratio', '{:.2f}'.format)
+]
+MINING_FORMATS = [
+    ('Network Difficulty', '{:.2f}M'.format),
+    ('Hashrate', '{:.2f} TH/s'.format),
+    ('Daily Revenue', '${:.2f}'.format),
+    ('Daily Power Cost', '${:.2f}'.format),
+    ('Daily Profit', '${:.2f}'.format),
+    ('Break-even Price', '${:.2f}'.format)
+]
+
+def format_metrics(formats, values):
+    """Render metric values into a label -> text dict"""
+    return {label: fmt(value) for (label, fmt), value in zip(formats, values)}
+
+def _new_axes(figsize):
+    """Create a standalone Agg figure with a single axes"""
+    # Built outside pyplot, so nothing needs closing once the figure is saved
+    fig = Figure(figsize=figsize)
+    FigureCanvasAgg(fig)
+    return fig, fig.add_subplot()
+
+def _plot_price_trend(timestamps, price, rolling_mean, path):
+    """Plot price with its 7-day moving average"""
+    fig, ax = _new_axes((12, 6))
+    ax.plot(timestamps, price, 'b-', label='Price')
+    ax.plot(timestamps, rolling_mean, 'r--', label='7-Day MA')
+    ax.set_title('Bitcoin Price and Moving Average')
+    ax.set_xlabel('Date')
+    ax.set_ylabel('Price (USD)')
+    ax.legend()
+    ax.grid(True, alpha=0.3)
+    ax.tick_params(axis='x', labelrotation=45)
+    fig.tight_layout()
+    fig.savefig(path, dpi=200, bbox_inches='tight')
+
+def _plot_returns_distribution(daily_return, path):
+    """Plot the distribution of daily returns"""
+    fig, ax = _new_axes((10, 6))
+    sns.histplot(daily_return, bins=20, ax=ax)
+    ax.set_title('Distribution of Daily Returns')
+    ax.set_xlabel('Daily Return (%)')
+    ax.set_ylabel('Frequency')
+    ax.grid(True, alpha=0.3)
+    fig.savefig(path, dpi=200, bbox_inches='tight')
+
+def _plot_rsi(timestamps, rsi_values, path):
+    """Plot RSI with overbought/oversold levels"""
+    fig, ax = _new_axes((12, 6))
+    ax.plot(timestamps, rsi_values)
+    ax.axhline(y=70, color='r', linestyle='--')
+    ax.axhline(y=30, color='g', linestyle='--')
+    ax.set_title('Relative Strength Index (RSI)')
+    ax.grid(True, alpha=0.3)
+    fig.savefig(path, dpi=200, bbox_inches='tight')
+
+def _plot_macd(timestamps, macd_line, signal_line, path):
+    """Plot MACD and its signal line"""
+    fig, ax = _new_axes((12, 6))
+    ax.plot(timestamps, macd_line, label='MACD')
+    ax.plot(timestamps, signal_line, label='Signal Line')
+    ax.set_title('MACD')
+    ax.legend()
+    ax.grid(True, alpha=0.3)
+    fig.savefig(path, dpi=200, bbox_inches='tight')
+
+def _plot_bollinger(timestamps, price, upper, middle, lower, path):
+    """Plot price inside its Bollinger Bands"""
+    fig, ax = _new_axes((12, 6))
+    ax.plot(timestamps, price, label='Price')
+    ax.plot(timestamps, upper, label='Upper Band')
+    ax.plot(timestamps, middle, label='Middle Band')
+    ax.plot(timestamps, lower, label='Lower Band')
+    ax.set_title('Bollinger Bands')
+    ax.legend()
+    ax.grid(True, alpha=0.3)
+    fig.savefig(path, dpi=200, bbox_inches='tight')
+
+def mining_metrics(last_price, difficulty, hashrate, power_cost, power_usage):
+    """Calculate mining economics for any broadcastable mix of scalar and array scenarios"""
+    last_price, difficulty, hashrate, power_cost, power_usage = np.broadcast_arrays(
+        *(np.asarray(x, dtype=np.float64) for x in (last_price, difficulty, hashrate, power_cost, power_usage))
+    )
+
+    # Daily power cost
+    daily_power_cost = (power_usage / 1000) * 24 * power_cost
+
+    # Estimated daily BTC reward (simplified)
+    daily_btc = (hashrate * 86400) / (difficulty * 2**32)
+
+    # Daily revenue and profit
+    daily_revenue = daily_btc * last_price
+
+    return {
+        'daily_power_cost': daily_power_cost,
+        'daily_btc': daily_btc,
+        'daily_revenue': daily_revenue,
+        'daily_profit': daily_revenue - daily_power_cost,
+        'break_even_price': daily_power_cost / daily_btc
+    }
+
+@dataclass
+class PriceSeries:
+    """Price history held as one contiguous NumPy array per column"""
+    timestamp: np.ndarray
+    price: np.ndarray
+    daily_return: np.ndarray
+    rolling_mean: np.ndarray
+    volatility: np.ndarray
+    rsi: np.ndarray = None
+    macd: np.ndarray = None
+    signal_line: np.ndarray = None
+    bb_middle: np.ndarray = None
+    bb_upper: np.ndarray = None
+    bb_lower: np.ndarray = None
+
+    def take(self, indices):
+        """Select the same rows from every column"""
+        return PriceSeries(**{
+            f.name: None if getattr(self, f.name) is None else getattr(self, f.name)[indices]
+            for f in fields(self)
+        })
+
 class MiningDataAnalyzer:
     def __init__(self):
         self.data_dir = Path('data')
         plt.style.use('default')
 
+    def read_cached_csv(self, name, parse_dates=None):
+        """Read a CSV from the data directory, reusing a Parquet copy while the CSV is unchanged"""
+        csv_path = self.data_dir / f'{name}.csv'
+        parquet_path = self.data_dir / f'{name}.parquet'
+
+        # The Parquet copy is only valid for the exact CSV it was built from;
+        # a timestamp comparison alone misses files copied with their mtime kept
+        stamp_path = self.data_dir / f'{name}.parquet.stamp'
+        csv_stat = csv_path.stat()
+        stamp = f'{csv_stat.st_mtime_ns} {csv_stat.st_size}'
+        if parquet_path.exists() and stamp_path.exists() and stamp_path.read_text() == stamp:
+            return pd.read_parquet(parquet_path)
+
+        try:
+            # PyArrow's multithreaded parser, when it is installed
+            df = pd.read_csv(csv_path, parse_dates=parse_dates, engine='pyarrow')
+        except ImportError:
+            df = pd.read_csv(csv_path, parse_dates=parse_dates)
+        try:
+            df.to_parquet(parquet_path, compression='snappy')
+            stamp_path.write_text(stamp)
+        except (ImportError, OSError):
+            # No Parquet engine installed or read-only data directory; keep
+            # parsing the CSV each run
+            pass
+        return df
+
     def read_data(self):
         """Read and prepare all data"""
         try:
-            self.price_data = pd.read_csv(self.data_dir / 'bitcoin_prices.csv')
-            self.market_data = pd.read_csv(self.data_dir / 'bitcoin_market_data.csv')
+            # Timestamps are parsed once and stored as datetimes in the Parquet copy
+            prices = self.read_cached_csv('bitcoin_prices', parse_dates=['timestamp'])
+            self.market_data = self.read_cached_csv('bitcoin_market_data')
             
-            # Convert timestamp to datetime
-            self.price_data['timestamp'] = pd.to_datetime(self.price_data['timestamp'])
+            # Keep only the column arrays. Prices and returns stay float64 for
+            # the reported statistics; chart-only series are computed in float32
+            timestamp = prices['timestamp'].to_numpy().astype('datetime64[s]')
+            price = prices['price'].to_numpy(dtype=np.float64)
             
             # Calculate basic metrics
-            self.price_data['daily_return'] = self.price_data['price'].pct_change() * 100
-            self.price_data['rolling_mean'] = self.price_data['price'].rolling(window=7).mean()
-            self.price_data['volatility'] = self.price_data['daily_return'].rolling(window=7).std()
+            returns = np.full(len(price), np.nan)
+            returns[1:] = (price[1:] / price[:-1] - 1) * 100
+            self.price_data = PriceSeries(
+                timestamp=timestamp,
+                price=price,
+                daily_return=returns,
+                rolling_mean=rolling_mean(price.astype(np.float32), 7),
+                volatility=rolling_std(returns, 7)
+            )
             
             # Calculate technical indicators
             self.calculate_technical_indicators()
@@ -34,57 +233,96 @@ class MiningDataAnalyzer:
 
     def calculate_technical_indicators(self):
         """Calculate technical analysis indicators"""
-        df = self.price_data
+        series = self.price_data
+        # float32 is ample for chart indicators and halves the bytes the
+        # rolling and EMA kernels have to move
+        price = series.price.astype(np.float32)
+        
+        # Reuse the indicators from a previous run on the same prices and settings
+        digest = blake2b(price.tobytes(), digest_size=8)
+        digest.update(repr((INDICATOR_CACHE_VERSION, str(price.dtype), RSI_PERIODS,
+                            MACD_SPANS, BOLLINGER_PARAMS)).encode())
+        key = digest.hexdigest()
+        cache_dir = self.data_dir / '.cache'
+        # A single entry, replaced whenever the key changes, so the cache
+        # never grows with the price history
+        cache_path = cache_dir / 'indicators.npz'
+        if cache_path.exists():
+            try:
+                with np.load(cache_path) as cached:
+                    stored_key = str(cached['key'])
+                    arrays = {name: cached[name] for name in INDICATOR_FIELDS}
+                if stored_key == key and all(len(values) == len(price) for values in arrays.values()):
+                    for name, values in arrays.items():
+                        setattr(series, name, values)
+                    return
+            except Exception:
+                # A damaged file fails in many ways (zip, zlib, npy header);
+                # whatever the cause, recompute and overwrite it below
+                pass
         
-        # RSI
-        delta = df['price'].diff()
-        gain = (delta.where(delta > 0, 0)).rolling(window=14).mean()
-        loss = (-delta.where(delta < 0, 0)).rolling(window=14).mean()
-        rs = gain / loss
-        df['RSI'] = 100 - (100 / (1 + rs))
-
-        # MACD
-        exp1 = df['price'].ewm(span=12, adjust=False).mean()
-        exp2 = df['price'].ewm(span=26, adjust=False).mean()
-        df['MACD'] = exp1 - exp2
-        df['Signal_Line'] = df['MACD'].ewm(span=9, adjust=False).mean()
-
-        # Bollinger Bands
-        df['BB_middle'] = df['price'].rolling(window=20).mean()
-        bb_std = df['price'].rolling(window=20).std()
-        df['BB_upper'] = df['BB_middle'] + (bb_std * 2)
-        df['BB_lower'] = df['BB_middle'] - (bb_std * 2)
+        # The three indicators only read price, and the compiled kernels
+        # release the GIL, so they run side by side in threads
+        with ThreadPoolExecutor(max_workers=3) as executor:
+            rsi_future = executor.submit(rsi, price, RSI_PERIODS)
+            macd_future = executor.submit(macd, price, *MACD_SPANS)
+            bands_future = executor.submit(bollinger_bands, price, *BOLLINGER_PARAMS)
+
+            # RSI
+            series.rsi = rsi_future.result()
+
+            # MACD
+            series.macd, series.signal_line = macd_future.result()
+
+            # Bollinger Bands
+            series.bb_middle, series.bb_upper, series.bb_lower = bands_future.result()
+
+        # Write to a per-process temporary file first so an interrupted run
+        # never leaves a truncated cache file behind; plain open() keeps the
+        # umask permissions the analyzer's other outputs get
+        tmp_path = cache_dir / f'indicators.{os.getpid()}.tmp'
+        try:
+            cache_dir.mkdir(exist_ok=True)
+            with open(tmp_path, 'wb') as tmp:
+                np.savez_compressed(tmp, key=np.array(key),
+                                    **{name: getattr(series, name) for name in INDICATOR_FIELDS})
+            os.replace(tmp_path, cache_path)
+        except OSError:
+            # Read-only data directory or full disk; recompute on the next run
+            tmp_path.unlink(missing_ok=True)
+            return
+
+        # Drop entries left by the earlier one-file-per-hash layout
+        for stale in cache_dir.glob('*.npz'):
+            if stale != cache_path:
+                stale.unlink(missing_ok=True)
 
     def calculate_risk_metrics(self):
         """Calculate risk analysis metrics"""
-        returns = self.price_data['daily_return'].dropna()
+        # Pull the returns out once and stay in NumPy for every metric
+        r = self.price_data.daily_return
+        r = r[~np.isnan(r)]
         
         # Value at Risk (95% confidence)
-        var_95 = np.percentile(returns, 5)
+        var_95 = np.quantile(r, 0.05)
         
         # Maximum Drawdown
-        cumulative_returns = (1 + returns/100).cumprod()
-        rolling_max = cumulative_returns.expanding().max()
+        cumulative_returns = np.cumprod(1 + r/100)
+        rolling_max = np.maximum.accumulate(cumulative_returns)
         drawdowns = cumulative_returns/rolling_max - 1
         max_drawdown = drawdowns.min() * 100
 
         # Annualized metrics
-        annual_return = returns.mean() * 252
-        annual_volatility = returns.std() * np.sqrt(252)
+        annual_return = r.mean() * 252
+        annual_volatility = r.std(ddof=1) * np.sqrt(252)
         sharpe_ratio = annual_return / annual_volatility if annual_volatility != 0 else 0
 
-        return {
-            'Value at Risk (95%)': f"{var_95:.2f}%",
-            'Maximum Drawdown': f"{max_drawdown:.2f}%",
-            'Annualized Return': f"{annual_return:.2f}%",
-            'Annualized Volatility': f"{annual_volatility:.2f}%",
-            'Sharpe Ratio': f"{sharpe_ratio:.2f}"
-        }
+        return format_metrics(RISK_FORMATS, [var_95, max_drawdown, annual_return, annual_volatility, sharpe_ratio])
 
     def calculate_mining_metrics(self):
         """Calculate mining-specific metrics"""
         # Placeholder for mining metrics - to be expanded with real data
-        last_price = self.price_data['price'].iloc[-1]
+        last_price = self.price_data.price[-1]
         
         # Example mining calculations
         difficulty = 71.8e6  # Example difficulty
@@ -92,90 +330,54 @@ class MiningDataAnalyzer:
         power_cost = 0.12   # Example power cost per kWh
         power_usage = 3000  # Example power usage in watts
         
-        # Daily power cost
-        daily_power_cost = (power_usage / 1000) * 24 * power_cost
-        
-        # Estimated daily BTC reward (simplified)
-        daily_btc = (hashrate * 86400) / (difficulty * 2**32)
-        
-        # Daily revenue and profit
-        daily_revenue = daily_btc * last_price
-        daily_profit = daily_revenue - daily_power_cost
-
-        return {
-            'Network Difficulty': f"{difficulty/1e6:.2f}M",
-            'Hashrate': f"{hashrate/1e6:.2f} TH/s",
-            'Daily Revenue': f"${daily_revenue:.2f}",
-            'Daily Power Cost': f"${daily_power_cost:.2f}",
-            'Daily Profit': f"${daily_profit:.2f}",
-            'Break-even Price': f"${(daily_power_cost/daily_btc):.2f}"
-        }
+        metrics = mining_metrics(last_price, difficulty, hashrate, power_cost, power_usage)
 
-    def create_technical_plots(self, figures_dir):
-        """Create technical analysis plots"""
-        # RSI Plot
-        plt.figure(figsize=(12, 6))
-        plt.plot(self.price_data['timestamp'], self.price_data['RSI'])
-        plt.axhline(y=70, color='r', linestyle='--')
-        plt.axhline(y=30, color='g', linestyle='--')
-        plt.title('Relative Strength Index (RSI)')
-        plt.grid(True, alpha=0.3)
-        plt.savefig(figures_dir / 'rsi.png', dpi=300, bbox_inches='tight')
-        plt.close()
-
-        # MACD Plot
-        plt.figure(figsize=(12, 6))
-        plt.plot(self.price_data['timestamp'], self.price_data['MACD'], label='MACD')
-        plt.plot(self.price_data['timestamp'], self.price_data['Signal_Line'], label='Signal Line')
-        plt.title('MACD')
-        plt.legend()
-        plt.grid(True, alpha=0.3)
-        plt.savefig(figures_dir / 'macd.png', dpi=300, bbox_inches='tight')
-        plt.close()
-
-        # Bollinger Bands
-        plt.figure(figsize=(12, 6))
-        plt.plot(self.price_data['timestamp'], self.price_data['price'], label='Price')
-        plt.plot(self.price_data['timestamp'], self.price_data['BB_upper'], label='Upper Band')
-        plt.plot(self.price_data['timestamp'], self.price_data['BB_middle'], label='Middle Band')
-        plt.plot(self.price_data['timestamp'], self.price_data['BB_lower'], label='Lower Band')
-        plt.title('Bollinger Bands')
-        plt.legend()
-        plt.grid(True, alpha=0.3)
-        plt.savefig(figures_dir / 'bollinger.png', dpi=300, bbox_inches='tight')
-        plt.close()
+        return format_metrics(MINING_FORMATS, [
+            difficulty / 1e6,
+            hashrate / 1e6,
+            metrics['daily_revenue'],
+            metrics['daily_power_cost'],
+            metrics['daily_profit'],
+            metrics['break_even_price']
+        ])
+
+    def create_technical_plots(self, series, figures_dir, executor):
+        """Submit technical analysis plots to the executor"""
+        return [
+            executor.submit(_plot_rsi, series.timestamp, series.rsi, figures_dir / 'rsi.png'),
+            executor.submit(_plot_macd, series.timestamp, series.macd,
+                            series.signal_line, figures_dir / 'macd.png'),
+            executor.submit(_plot_bollinger, series.timestamp, series.price,
+                            series.bb_upper, series.bb_middle,
+                            series.bb_lower, figures_dir / 'bollinger.png')
+        ]
 
     def create_visualizations(self):
         """Create and save all visualization plots"""
         figures_dir = self.data_dir / 'figures'
         figures_dir.mkdir(exist_ok=True)
 
-        # Original plots
-        plt.figure(figsize=(12, 6))
-        plt.plot(self.price_data['timestamp'], self.price_data['price'], 'b-', label='Price')
-        plt.plot(self.price_data['timestamp'], self.price_data['rolling_mean'], 'r--', label='7-Day MA')
-        plt.title('Bitcoin Price and Moving Average')
-        plt.xlabel('Date')
-        plt.ylabel('Price (USD)')
-        plt.legend()
-        plt.grid(True, alpha=0.3)
-        plt.xticks(rotation=45)
-        plt.tight_layout()
-        plt.savefig(figures_dir / 'price_trend.png', dpi=300, bbox_inches='tight')
-        plt.close()
-
-        # Returns Distribution
-        plt.figure(figsize=(10, 6))
-        sns.histplot(self.price_data['daily_return'].dropna(), bins=20)
-        plt.title('Distribution of Daily Returns')
-        plt.xlabel('Daily Return (%)')
-        plt.ylabel('Frequency')
-        plt.grid(True, alpha=0.3)
-        plt.savefig(figures_dir / 'returns_distribution.png', dpi=300, bbox_inches='tight')
-        plt.close()
-
-        # Technical Analysis plots
-        self.create_technical_plots(figures_dir)
+        # Line plots only need the rows that shape the price curve; picking
+        # them once keeps every series aligned
+        series = self.price_data.take(lttb_indices(self.price_data.price))
+        returns = self.price_data.daily_return
+
+        # Each plot is independent and CPU-bound in Agg rasterization, so
+        # render them in parallel processes from plain arrays
+        with ProcessPoolExecutor(max_workers=min(5, os.cpu_count() or 1)) as executor:
+            futures = [
+                executor.submit(_plot_price_trend, series.timestamp, series.price,
+                                series.rolling_mean, figures_dir / 'price_trend.png'),
+                executor.submit(_plot_returns_distribution, returns[~np.isnan(returns)],
+                                figures_dir / 'returns_distribution.png')
+            ]
+
+            # Technical Analysis plots
+            futures += self.create_technical_plots(series, figures_dir, executor)
+
+            # Surface any plotting error
+            for future in futures:
+                future.result()
 
     def print_analysis(self):
         """Print comprehensive analysis results"""
@@ -183,19 +385,20 @@ class MiningDataAnalyzer:
         print(f"\nAnalysis generated at: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
         
         print("\nTimestamp Range:")
-        print(f"From: {self.price_data['timestamp'].min()}")
-        print(f"To: {self.price_data['timestamp'].max()}")
+        print(f"From: {pd.Timestamp(self.price_data.timestamp.min())}")
+        print(f"To: {pd.Timestamp(self.price_data.timestamp.max())}")
 
         # Basic stats
+        price = self.price_data.price
         price_stats = {
-            'Price Statistics': {
-                'Current Price': f"${self.price_data['price'].iloc[-1]:.2f}",
-                'Average Price': f"${self.price_data['price'].mean():.2f}",
-                'Highest Price': f"${self.price_data['price'].max():.2f}",
-                'Lowest Price': f"${self.price_data['price'].min():.2f}",
-                'Price Volatility': f"${self.price_data['price'].std():.2f}",
-                '7-Day Rolling Volatility': f"{self.price_data['volatility'].iloc[-1]:.2f}%"
-            }
+            'Price Statistics': format_metrics(PRICE_FORMATS, [
+                price[-1],
+                np.nanmean(price),
+                np.nanmax(price),
+                np.nanmin(price),
+                np.nanstd(price, ddof=1),
+                self.price_data.volatility[-1]
+            ])
         }
 
         # Print all statistics
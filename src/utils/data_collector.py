@@ -1,12 +1,14 @@
 import requests
+from requests.adapters import HTTPAdapter
 import pandas as pd
+import numpy as np
 import os
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 from dotenv import load_dotenv
-import streamlit as st  # Added this import
 
 class CryptoDataCollector:
-    def __init__(self):
+    def __init__(self, http_cache=False):
         self.api_key = self.get_api_key()
         if not self.api_key:
             raise ValueError("No API key found")
@@ -14,26 +16,53 @@ class CryptoDataCollector:
         self.headers = {
             'X-CG-API-KEY': self.api_key
         }
+        self.session = self.create_session(http_cache)
         self.price_data = None
         self.market_data = None
 
+    def create_session(self, http_cache=False):
+        """Create a persistent HTTP session, optionally backed by an on-disk response cache"""
+        if http_cache:
+            # Optional dependency: only needed when the cache is enabled
+            import requests_cache
+            session = requests_cache.CachedSession('data/.http_cache', expire_after=300)
+        else:
+            session = requests.Session()
+
+        # Reuse TCP/TLS connections to the API host across requests
+        adapter = HTTPAdapter(pool_connections=4, pool_maxsize=4)
+        session.mount('https://', adapter)
+        session.headers.update(self.headers)
+        return session
+
     def get_api_key(self):  # Fixed indentation - was inside __init__
         """Get API key from environment variables or Streamlit secrets"""
         # Try .env file first
         load_dotenv()
         api_key = os.getenv('COINGECKO_API_KEY')
         
-        # If not in .env, try Streamlit secrets
-        if not api_key and hasattr(st, 'secrets'):
-            api_key = st.secrets.get('COINGECKO_API_KEY')
+        # If not in .env, try Streamlit secrets; imported here so scripts
+        # using the collector outside the dashboard skip loading streamlit
+        if not api_key:
+            try:
+                import streamlit as st
+            except ImportError:
+                st = None
+            if hasattr(st, 'secrets'):
+                api_key = st.secrets.get('COINGECKO_API_KEY')
             
         return api_key
 
     def collect_all_data(self):
         """Collect all necessary data"""
         try:
-            self.price_data = self.get_bitcoin_price()
-            self.market_data = self.get_bitcoin_market_data()
+            # The two requests are independent, so run them side by side
+            # over the session's pooled connections
+            with ThreadPoolExecutor(max_workers=2) as executor:
+                price_future = executor.submit(self.get_bitcoin_price)
+                market_future = executor.submit(self.get_bitcoin_market_data)
+                self.price_data = price_future.result()
+                self.market_data = market_future.result()
             return True
         except Exception as e:
             print(f"Error collecting data: {e}")
@@ -49,18 +78,31 @@ class CryptoDataCollector:
         }
         
         try:
-            response = requests.get(url, headers=self.headers, params=params)
+            response = self.session.get(url, params=params, timeout=10)
             response.raise_for_status()
             data = response.json()
             
-            df = pd.DataFrame(data['prices'], columns=['timestamp', 'price'])
-            df['timestamp'] = pd.to_datetime(df['timestamp'], unit='ms')
+            # Parse [timestamp, price] pairs straight into one float array
+            prices = np.asarray(data['prices'], dtype=np.float64).reshape(-1, 2)
+            price = prices[:, 1]
+            
+            # Calculate additional metrics on the array before wrapping it
+            daily_return = np.full(len(price), np.nan)
+            daily_return[1:] = (price[1:] / price[:-1] - 1) * 100
             
-            # Calculate additional metrics
-            df['daily_return'] = df['price'].pct_change() * 100
-            df['rolling_mean'] = df['price'].rolling(window=7).mean()
+            # 7-day moving average as a boxcar convolution, NaN until the
+            # first full window; kept inline so the collector does not load numba
+            rolling_mean = np.full(len(price), np.nan)
+            if len(price) >= 7:
+                rolling_mean[6:] = np.convolve(price, np.full(7, 1 / 7), mode='valid')
             
-            return df
+            # Epoch milliseconds reinterpreted in place, no per-element parsing
+            return pd.DataFrame({
+                'timestamp': prices[:, 0].astype(np.int64).view('datetime64[ms]'),
+                'price': price,
+                'daily_return': daily_return,
+                'rolling_mean': rolling_mean
+            })
             
         except requests.exceptions.RequestException as e:
             print(f"Error fetching Bitcoin price data: {e}")
@@ -71,7 +113,7 @@ class CryptoDataCollector:
         url = "https://api.coingecko.com/api/v3/coins/bitcoin"
         
         try:
-            response = requests.get(url, headers=self.headers)
+            response = self.session.get(url, timeout=10)
             response.raise_for_status()
             data = response.json()
             
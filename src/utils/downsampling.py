@@ -0,0 +1,35 @@
+import numpy as np
+
+# Enough points to keep a full-width chart visually identical
+MAX_POINTS = 2000
+
+def lttb_indices(y, threshold=MAX_POINTS):
+    """Select indices of y that preserve its shape (Largest-Triangle-Three-Buckets)"""
+    y = np.asarray(y, dtype=np.float64)
+    n = len(y)
+    if threshold >= n or threshold < 3:
+        return np.arange(n)
+
+    sampled = np.empty(threshold, dtype=np.intp)
+    sampled[0] = 0
+    sampled[-1] = n - 1
+
+    # Points are treated as evenly spaced, which holds for sampled price series
+    every = (n - 2) / (threshold - 2)
+    a = 0
+    for i in range(threshold - 2):
+        start = int(i * every) + 1
+        end = int((i + 1) * every) + 1
+        next_end = min(int((i + 2) * every) + 1, n)
+
+        # Average of the next bucket is the third vertex of each triangle
+        avg_x = (end + next_end - 1) / 2
+        avg_y = y[end:next_end].mean()
+
+        # Keep the point forming the largest triangle with the previous pick
+        x = np.arange(start, end)
+        areas = np.abs((a - avg_x) * (y[start:end] - y[a]) - (a - x) * (avg_y - y[a]))
+        a = start + int(np.argmax(areas))
+        sampled[i + 1] = a
+
+    return sampled
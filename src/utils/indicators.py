@@ -0,0 +1,221 @@
+import numpy as np
+import pandas as pd
+from numpy.lib.stride_tricks import sliding_window_view
+from utils._njit import njit, HAS_NUMBA
+
+def _nan_array(values):
+    """Allocate a NaN-filled output keeping the float precision of values"""
+    return np.full(len(values), np.nan, dtype=np.result_type(values.dtype, np.float32))
+
+def rolling_mean(values, window):
+    """Calculate a rolling mean, NaN until the first full window"""
+    out = _nan_array(values)
+    if len(values) >= window:
+        # A boxcar convolution is one pass; NaNs spread to every window holding them, as in pandas
+        boxcar = np.full(window, 1 / window, dtype=out.dtype)
+        out[window - 1:] = np.convolve(values, boxcar, mode='valid')
+    return out
+
+@njit(cache=True, nogil=True)
+def _rolling_mean_std_kernel(values, window):
+    """Slide a Welford accumulator over values, adding and dropping one point per step"""
+    n = len(values)
+    mean_out = np.empty(n, dtype=values.dtype)
+    std_out = np.empty(n, dtype=values.dtype)
+    count = 0
+    nan_count = 0
+    mean = 0.0
+    m2 = 0.0
+    for i in range(n):
+        x = values[i]
+        if np.isnan(x):
+            nan_count += 1
+        else:
+            count += 1
+            delta = x - mean
+            mean += delta / count
+            m2 += delta * (x - mean)
+
+        if i >= window:
+            x = values[i - window]
+            if np.isnan(x):
+                nan_count -= 1
+            else:
+                count -= 1
+                if count == 0:
+                    mean = 0.0
+                    m2 = 0.0
+                else:
+                    delta = x - mean
+                    mean -= delta / count
+                    m2 -= delta * (x - mean)
+
+        # Like pandas, any NaN inside the window makes the result NaN
+        if i < window - 1 or nan_count > 0:
+            mean_out[i] = np.nan
+            std_out[i] = np.nan
+        else:
+            mean_out[i] = mean
+            std_out[i] = np.sqrt(max(m2, 0.0) / (window - 1)) if window > 1 else np.nan
+    return mean_out, std_out
+
+def rolling_std(values, window):
+    """Calculate a rolling sample standard deviation, NaN until the first full window"""
+    if HAS_NUMBA:
+        # The Welford kernel needs the running mean anyway
+        return _rolling_mean_std_kernel(values, window)[1]
+
+    # Vectorized fallback rather than running the kernel loop as plain Python
+    std = _nan_array(values)
+    if len(values) >= window > 1:
+        std[window - 1:] = sliding_window_view(values, window).std(axis=1, ddof=1)
+    return std
+
+def rolling_mean_std(values, window):
+    """Calculate a rolling mean and sample standard deviation in one pass"""
+    if HAS_NUMBA:
+        return _rolling_mean_std_kernel(values, window)
+    return rolling_mean(values, window), rolling_std(values, window)
+
+@njit(cache=True)
+def _gain_loss(price, i):
+    """Split the move into bar i into its gain and loss parts"""
+    if i == 0:
+        return 0.0, 0.0
+    delta = price[i] - price[i - 1]
+    # NaN deltas fail both tests and count as no movement, like pandas .where()
+    if delta > 0:
+        return delta, 0.0
+    if delta < 0:
+        return 0.0, -delta
+    return 0.0, 0.0
+
+@njit(cache=True, nogil=True)
+def _rsi_kernel(price, periods):
+    """Keep running window sums of gains and losses in a single pass"""
+    n = len(price)
+    out = np.empty(n, dtype=price.dtype)
+    gain_sum = 0.0
+    loss_sum = 0.0
+    gain_count = 0
+    loss_count = 0
+    for i in range(n):
+        gain, loss = _gain_loss(price, i)
+        gain_sum += gain
+        loss_sum += loss
+        gain_count += gain > 0
+        loss_count += loss > 0
+        if i >= periods:
+            gain, loss = _gain_loss(price, i - periods)
+            gain_sum -= gain
+            loss_sum -= loss
+            gain_count -= gain > 0
+            loss_count -= loss > 0
+
+        # Reset empty windows so rounding residue cannot leak into the ratio
+        if gain_count == 0:
+            gain_sum = 0.0
+        if loss_count == 0:
+            loss_sum = 0.0
+
+        if i < periods - 1:
+            out[i] = np.nan
+        elif loss_sum > 0:
+            out[i] = 100 - (100 / (1 + gain_sum / loss_sum))
+        elif gain_sum > 0:
+            out[i] = 100.0
+        else:
+            out[i] = np.nan
+    return out
+
+def _rsi_numpy(price, periods):
+    """Vectorized RSI for when the loop kernel cannot be compiled"""
+    out = _nan_array(price)
+    if len(price) < periods:
+        return out
+    delta = np.zeros_like(price)
+    delta[1:] = np.diff(price)
+    # fmax drops NaN deltas to 0, matching the kernel
+    gain = np.fmax(delta, 0)
+    loss = np.fmax(-delta, 0)
+    boxcar = np.ones(periods, dtype=price.dtype)
+    gain_sum = np.convolve(gain, boxcar, mode='valid')
+    loss_sum = np.convolve(loss, boxcar, mode='valid')
+    # A zero loss sum gives 100 (or NaN with no gains either) straight from the formula
+    with np.errstate(divide='ignore', invalid='ignore'):
+        out[periods - 1:] = 100 - (100 / (1 + gain_sum / loss_sum))
+    return out
+
+def rsi(price, periods=14):
+    """Calculate Relative Strength Index from simple averages of gains and losses"""
+    if HAS_NUMBA:
+        return _rsi_kernel(price, periods)
+    return _rsi_numpy(price, periods)
+
+@njit(cache=True)
+def _ewm_update(mean, old_weight, x, alpha):
+    """Advance a pandas ewm(adjust=False) mean by one input, NaN gaps included"""
+    # Like ignore_na=False, a gap keeps decaying the old mean's weight
+    old_weight *= 1 - alpha
+    if np.isnan(x):
+        return mean, old_weight
+    if np.isnan(mean):
+        return x, 1.0
+    if mean != x:
+        mean = (old_weight * mean + alpha * x) / (old_weight + alpha)
+    return mean, 1.0
+
+@njit(cache=True, nogil=True)
+def _macd_kernel(price, alpha_fast, alpha_slow, alpha_signal):
+    """Run the fast, slow and signal EMAs together in a single pass"""
+    n = len(price)
+    macd_line = np.empty(n, dtype=price.dtype)
+    signal_line = np.empty(n, dtype=price.dtype)
+
+    # Each EMA starts at its first non-NaN input and carries across NaN prices
+    fast, fast_weight = np.nan, 1.0
+    slow, slow_weight = np.nan, 1.0
+    signal, signal_weight = np.nan, 1.0
+    for i in range(n):
+        fast, fast_weight = _ewm_update(fast, fast_weight, price[i], alpha_fast)
+        slow, slow_weight = _ewm_update(slow, slow_weight, price[i], alpha_slow)
+        macd_line[i] = fast - slow
+        signal, signal_weight = _ewm_update(signal, signal_weight, macd_line[i], alpha_signal)
+        signal_line[i] = signal
+    return macd_line, signal_line
+
+def _macd_pandas(price, fast, slow, signal):
+    """MACD from pandas' compiled ewm for when the loop kernel cannot be compiled"""
+    series = pd.Series(price)
+    macd_line = series.ewm(span=fast, adjust=False).mean() - series.ewm(span=slow, adjust=False).mean()
+    signal_line = macd_line.ewm(span=signal, adjust=False).mean()
+    dtype = _nan_array(price).dtype
+    return macd_line.to_numpy(dtype=dtype), signal_line.to_numpy(dtype=dtype)
+
+def macd(price, fast=12, slow=26, signal=9):
+    """Calculate MACD and Signal Line"""
+    if HAS_NUMBA:
+        return _macd_kernel(price, 2 / (fast + 1), 2 / (slow + 1), 2 / (signal + 1))
+    return _macd_pandas(price, fast, slow, signal)
+
+def bollinger_bands(price, window=20, num_std=2):
+    """Calculate Bollinger Bands"""
+    middle_band, std_dev = rolling_mean_std(price, window)
+    upper_band = middle_band + (std_dev * num_std)
+    lower_band = middle_band - (std_dev * num_std)
+    return middle_band, upper_band, lower_band
+
+def rolling_corr(x, y, window):
+    """Calculate a rolling Pearson correlation, NaN until the first full window"""
+    out = _nan_array(x)
+    if len(x) >= window:
+        x_windows = sliding_window_view(x, window)
+        y_windows = sliding_window_view(y, window)
+        x_centered = x_windows - x_windows.mean(axis=1, keepdims=True)
+        y_centered = y_windows - y_windows.mean(axis=1, keepdims=True)
+        cov = np.einsum('ij,ij->i', x_centered, y_centered)
+        var_x = np.einsum('ij,ij->i', x_centered, x_centered)
+        var_y = np.einsum('ij,ij->i', y_centered, y_centered)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            out[window - 1:] = cov / np.sqrt(var_x * var_y)
+    return out